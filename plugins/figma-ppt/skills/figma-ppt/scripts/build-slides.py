@@ -3,7 +3,9 @@
 build-slides.py — figma-ppt HTML Slide Builder
 
 Reads slides-plan.json and generates a multi-page HTML/CSS website.
-Each slide = a standalone 1920×1080 HTML page.
+Each slide = one 1920×1080 HTML page, styled by the deck-wide slides/_shared.css
+(pages need it alongside them to render). slides/all.html holds every slide on
+one page, anchored as #slide-NN.
 Pages are served locally and captured via generate_figma_design into Figma.
 
 Usage:
@@ -12,20 +14,26 @@ Usage:
     --output-dir  ./slide-output
 """
 
-import argparse
+import hashlib
 import json
 import os
 import sys
+from html import escape
 from pathlib import Path
-from datetime import datetime, timezone
+from string import Template
+
+try:
+    import orjson  # optional: faster JSON parse/serialize
+except ImportError:
+    orjson = None
 
 # ─────────────────────────────────────────────────────────────
-# SHARED CSS (injected into every slide page)
+# SHARED CSS (written once per deck to slides/_shared.css)
 # ─────────────────────────────────────────────────────────────
 
-SHARED_CSS = """
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&family=Space+Grotesk:wght@300;400;500;600;700&family=DM+Sans:ital,wght@0,300;0,400;0,500;0,700;1,400&family=Playfair+Display:ital,wght@0,400;0,700;1,400&family=JetBrains+Mono:wght@400;500;700&family=Cormorant+Garamond:ital,wght@0,300;0,600;1,300&family=Plus+Jakarta+Sans:wght@400;500;600;700;800&display=swap');
+SHARED_CSS_FILE = "_shared.css"
 
+SHARED_CSS = """
 *, *::before, *::after {
   box-sizing: border-box;
   margin: 0;
@@ -33,14 +41,14 @@ SHARED_CSS = """
 }
 
 :root {
-  --primary:       %(primary)s;
-  --background:    %(background)s;
-  --surface:       %(surface)s;
-  --accent:        %(accent)s;
-  --text-primary:  %(textPrimary)s;
-  --text-secondary:%(textSecondary)s;
-  --font-display:  '%(fontDisplay)s', Inter, sans-serif;
-  --font-body:     '%(fontBody)s', Inter, sans-serif;
+  --primary:       ${primary};
+  --background:    ${background};
+  --surface:       ${surface};
+  --accent:        ${accent};
+  --text-primary:  ${textPrimary};
+  --text-secondary:${textSecondary};
+  --font-display:  '${fontDisplay}', Inter, sans-serif;
+  --font-body:     '${fontBody}', Inter, sans-serif;
 }
 
 html, body {
@@ -67,7 +75,7 @@ html, body {
 .accent-stripe {
   position: absolute;
   left: 0; top: 0;
-  width: 6px; height: 100%%;
+  width: 6px; height: 100%;
   background: var(--primary);
 }
 
@@ -96,44 +104,59 @@ html, body {
 """
 
 # ─────────────────────────────────────────────────────────────
-# SLIDE HTML BUILDERS — one function per slide type
+# JSON I/O — orjson when installed, stdlib json otherwise
 # ─────────────────────────────────────────────────────────────
 
-def slide_hero(c, idx, palette, fonts):
-    title    = c.get("title", "")
-    subtitle = c.get("subtitle", "")
-    tagline  = c.get("tagline", "")
-    author   = c.get("author", "")
-    date     = c.get("date", "")
+def json_loads(data):
+    """Parse JSON from UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    return f"""
-<div class="slide slide-hero">
-  <!-- Left color panel -->
-  <div class="hero-panel-left">
-    {f'<div class="hero-tagline">{tagline}</div>' if tagline else ''}
-    <h1 class="hero-title">{title}</h1>
-    <div class="hero-rule"></div>
-    <div class="hero-meta">
-      {f'<span class="hero-author">{author}</span>' if author else ''}
-      {f'<span class="hero-sep">·</span><span class="hero-date">{date}</span>' if date and author else f'<span class="hero-date">{date}</span>' if date else ''}
-    </div>
-  </div>
 
-  <!-- Right content panel -->
-  <div class="hero-panel-right">
-    {f'<p class="hero-subtitle">{subtitle}</p>' if subtitle else ''}
-    <div class="hero-deco-num">01</div>
-  </div>
+def json_dumps(obj):
+    """Serialize to 2-space-indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────
+# NUMBER LABELS — "01", "02", … without a format-spec parse per use
+# ─────────────────────────────────────────────────────────────
+
+TWO_DIGIT = tuple(f"{n:02d}" for n in range(100))
 
-  <!-- Corner accent -->
-  <div class="hero-corner-accent"></div>
-</div>
 
-<style>
-.slide-hero {{
+def pad2(n):
+    """Same as f"{n:02d}", via table lookup for 0-99."""
+    return TWO_DIGIT[n] if 0 <= n < 100 else f"{n:02d}"
+
+
+# ─────────────────────────────────────────────────────────────
+# ESCAPING
+# ─────────────────────────────────────────────────────────────
+
+def esc(value):
+    """HTML-escape a plan value for use as element text (None → "")."""
+    if value is None:
+        return ""
+    return escape(str(value), quote=False)
+
+
+# ─────────────────────────────────────────────────────────────
+# SLIDE HTML BUILDERS — one function per slide type
+# Static CSS for each type is a plain module-level constant built
+# once at import; the builders only format the dynamic markup.
+# Palette and fonts reach slides only through the CSS variables in
+# _shared.css, so builders take just (content, index).
+# ─────────────────────────────────────────────────────────────
+
+HERO_CSS = """
+.slide-hero {
   display: flex;
-}}
-.hero-panel-left {{
+}
+.hero-panel-left {
   width: 55%;
   height: 100%;
   background: var(--primary);
@@ -142,8 +165,8 @@ def slide_hero(c, idx, palette, fonts):
   justify-content: center;
   padding: 96px;
   position: relative;
-}}
-.hero-tagline {{
+}
+.hero-tagline {
   font-family: var(--font-body);
   font-size: 13px;
   font-weight: 600;
@@ -151,8 +174,8 @@ def slide_hero(c, idx, palette, fonts):
   text-transform: uppercase;
   color: rgba(255,255,255,0.65);
   margin-bottom: 32px;
-}}
-.hero-title {{
+}
+.hero-title {
   font-family: var(--font-display);
   font-size: 80px;
   font-weight: 800;
@@ -160,23 +183,23 @@ def slide_hero(c, idx, palette, fonts):
   letter-spacing: -2px;
   color: #ffffff;
   margin-bottom: 48px;
-}}
-.hero-rule {{
+}
+.hero-rule {
   width: 64px;
   height: 3px;
   background: rgba(255,255,255,0.4);
   margin-bottom: 32px;
-}}
-.hero-meta {{
+}
+.hero-meta {
   display: flex;
   align-items: center;
   gap: 12px;
   font-size: 16px;
   color: rgba(255,255,255,0.75);
   font-weight: 400;
-}}
-.hero-sep {{ opacity: 0.4; }}
-.hero-panel-right {{
+}
+.hero-sep { opacity: 0.4; }
+.hero-panel-right {
   flex: 1;
   background: var(--surface);
   display: flex;
@@ -184,16 +207,16 @@ def slide_hero(c, idx, palette, fonts):
   justify-content: center;
   padding: 96px 80px;
   position: relative;
-}}
-.hero-subtitle {{
+}
+.hero-subtitle {
   font-family: var(--font-display);
   font-size: 36px;
   font-weight: 300;
   line-height: 1.4;
   color: var(--text-primary);
   max-width: 520px;
-}}
-.hero-deco-num {{
+}
+.hero-deco-num {
   position: absolute;
   right: 64px;
   bottom: 64px;
@@ -203,8 +226,8 @@ def slide_hero(c, idx, palette, fonts):
   opacity: 0.06;
   line-height: 1;
   font-family: var(--font-display);
-}}
-.hero-corner-accent {{
+}
+.hero-corner-accent {
   position: absolute;
   bottom: 0;
   left: 55%;
@@ -213,52 +236,53 @@ def slide_hero(c, idx, palette, fonts):
   height: 80px;
   background: var(--primary);
   opacity: 0.3;
-}}
-</style>
+}
 """
 
 
-def slide_agenda(c, idx, palette, fonts):
-    heading      = c.get("heading", "Agenda")
-    section_label = c.get("sectionLabel", "OVERVIEW")
-    items        = c.get("items", [])
-
-    items_html = ""
-    for i, item in enumerate(items):
-        num = f"{i+1:02d}"
-        items_html += f"""
-        <div class="agenda-item">
-          <span class="agenda-num">{num}</span>
-          <span class="agenda-divider"></span>
-          <span class="agenda-text">{item}</span>
-        </div>"""
+def slide_hero(c, idx):
+    title    = esc(c.get("title", ""))
+    subtitle = esc(c.get("subtitle", ""))
+    tagline  = esc(c.get("tagline", ""))
+    author   = esc(c.get("author", ""))
+    date     = esc(c.get("date", ""))
 
     return f"""
-<div class="slide slide-agenda">
-  <div class="accent-stripe"></div>
-
-  <div class="agenda-content">
-    <div class="section-label">{section_label}</div>
-    <h2 class="agenda-heading">{heading}</h2>
-    <div class="agenda-items">
-      {items_html}
+<div class="slide slide-hero">
+  <!-- Left color panel -->
+  <div class="hero-panel-left">
+    {f'<div class="hero-tagline">{tagline}</div>' if tagline else ''}
+    <h1 class="hero-title">{title}</h1>
+    <div class="hero-rule"></div>
+    <div class="hero-meta">
+      {f'<span class="hero-author">{author}</span>' if author else ''}
+      {f'<span class="hero-sep">·</span><span class="hero-date">{date}</span>' if date and author else f'<span class="hero-date">{date}</span>' if date else ''}
     </div>
   </div>
 
-  <div class="slide-num">{idx:02d}</div>
+  <!-- Right content panel -->
+  <div class="hero-panel-right">
+    {f'<p class="hero-subtitle">{subtitle}</p>' if subtitle else ''}
+    <div class="hero-deco-num">01</div>
+  </div>
+
+  <!-- Corner accent -->
+  <div class="hero-corner-accent"></div>
 </div>
+"""
+
 
-<style>
-.slide-agenda {{
+AGENDA_CSS = """
+.slide-agenda {
   display: flex;
   align-items: center;
   padding-left: 120px;
-}}
-.agenda-content {{
+}
+.agenda-content {
   width: 100%;
   max-width: 1400px;
-}}
-.agenda-heading {{
+}
+.agenda-heading {
   font-family: var(--font-display);
   font-size: 56px;
   font-weight: 700;
@@ -266,134 +290,122 @@ def slide_agenda(c, idx, palette, fonts):
   color: var(--text-primary);
   margin-bottom: 64px;
   line-height: 1.1;
-}}
-.agenda-items {{
+}
+.agenda-items {
   display: flex;
   flex-direction: column;
   gap: 0;
-}}
-.agenda-item {{
+}
+.agenda-item {
   display: flex;
   align-items: center;
   gap: 32px;
   padding: 24px 0;
   border-bottom: 1px solid rgba(255,255,255,0.07);
-}}
-.agenda-item:first-child {{
+}
+.agenda-item:first-child {
   border-top: 1px solid rgba(255,255,255,0.07);
-}}
-.agenda-num {{
+}
+.agenda-num {
   font-family: var(--font-display);
   font-size: 20px;
   font-weight: 700;
   color: var(--primary);
   min-width: 36px;
   letter-spacing: 0.05em;
-}}
-.agenda-divider {{
+}
+.agenda-divider {
   width: 1px;
   height: 24px;
   background: rgba(255,255,255,0.15);
-}}
-.agenda-text {{
+}
+.agenda-text {
   font-family: var(--font-display);
   font-size: 28px;
   font-weight: 500;
   color: var(--text-primary);
   letter-spacing: -0.3px;
-}}
-</style>
+}
 """
 
 
-def slide_content(c, idx, palette, fonts):
-    heading      = c.get("heading", "")
-    section_label = c.get("sectionLabel", "")
-    body         = c.get("body", "")
-    bullets      = c.get("bullets", [])
-    has_image    = bool(c.get("imageHint"))
-
-    bullets_html = ""
-    for b in bullets:
-        bullets_html += f'<li class="content-bullet">{b}</li>'
+def slide_agenda(c, idx):
+    heading      = esc(c.get("heading", "Agenda"))
+    section_label = esc(c.get("sectionLabel", "OVERVIEW"))
+    items        = [esc(x) for x in c.get("items", [])]
 
-    image_html = ""
-    if has_image:
-        image_html = f"""
-        <div class="content-image-placeholder">
-          <span class="content-image-hint">{c.get('imageHint', '')}</span>
-        </div>"""
-
-    layout_class = "content-layout-split" if has_image else "content-layout-full"
+    items_html = "".join(f"""
+        <div class="agenda-item">
+          <span class="agenda-num">{pad2(i)}</span>
+          <span class="agenda-divider"></span>
+          <span class="agenda-text">{item}</span>
+        </div>""" for i, item in enumerate(items, start=1))
 
     return f"""
-<div class="slide slide-content">
-  <!-- Header bar -->
-  <div class="content-header">
-    {f'<div class="section-label">{section_label}</div>' if section_label else ''}
-    <h2 class="content-heading">{heading}</h2>
-  </div>
+<div class="slide slide-agenda">
+  <div class="accent-stripe"></div>
 
-  <!-- Body area -->
-  <div class="content-body {layout_class}">
-    <div class="content-text">
-      {f'<p class="content-body-text">{body}</p>' if body else ''}
-      {f'<ul class="content-bullets">{bullets_html}</ul>' if bullets else ''}
+  <div class="agenda-content">
+    <div class="section-label">{section_label}</div>
+    <h2 class="agenda-heading">{heading}</h2>
+    <div class="agenda-items">
+      {items_html}
     </div>
-    {image_html}
   </div>
 
-  <div class="slide-num">{idx:02d}</div>
+  <div class="slide-num">{pad2(idx)}</div>
 </div>
+"""
 
-<style>
-.slide-content {{
+
+CONTENT_CSS = """
+.slide-content {
   display: flex;
   flex-direction: column;
-}}
-.content-header {{
+}
+.content-header {
   padding: 64px 96px 48px;
   border-bottom: 1px solid rgba(255,255,255,0.08);
   background: var(--surface);
-}}
-.content-heading {{
+}
+.content-heading {
   font-family: var(--font-display);
   font-size: 52px;
   font-weight: 700;
   letter-spacing: -1.5px;
   line-height: 1.1;
   color: var(--text-primary);
-}}
-.content-body {{
+}
+.content-body {
   flex: 1;
   padding: 56px 96px;
   display: flex;
   gap: 80px;
-}}
-.content-layout-full .content-text {{ max-width: 1100px; }}
-.content-layout-split .content-text {{ width: 55%; }}
-.content-body-text {{
+}
+.content-layout-full .content-text { max-width: 1100px; }
+.content-layout-split .content-text { width: 55%; }
+.content-body-text {
   font-size: 22px;
   line-height: 1.65;
   color: var(--text-secondary);
   margin-bottom: 36px;
   font-weight: 400;
-}}
-.content-bullets {{
+}
+.content-bullets {
   list-style: none;
   display: flex;
   flex-direction: column;
   gap: 20px;
-}}
-.content-bullet {{
+}
+.content-bullet {
   font-size: 24px;
   line-height: 1.5;
   color: var(--text-primary);
   font-weight: 400;
   padding-left: 28px;
   position: relative;
-}}
-.content-bullet::before {{
+}
+.content-bullet::before {
   content: '';
   position: absolute;
   left: 0;
@@ -402,8 +414,8 @@ def slide_content(c, idx, palette, fonts):
   height: 8px;
   border-radius: 50%;
   background: var(--primary);
-}}
-.content-image-placeholder {{
+}
+.content-image-placeholder {
   flex: 1;
   background: var(--surface);
   border: 1px solid rgba(255,255,255,0.08);
@@ -412,64 +424,71 @@ def slide_content(c, idx, palette, fonts):
   align-items: center;
   justify-content: center;
   min-height: 400px;
-}}
-.content-image-hint {{
+}
+.content-image-hint {
   font-size: 14px;
   color: var(--text-secondary);
   text-align: center;
   max-width: 240px;
   opacity: 0.5;
-}}
-</style>
+}
 """
 
 
-def slide_two_col(c, idx, palette, fonts):
-    heading      = c.get("heading", "")
-    section_label = c.get("sectionLabel", "")
-    left         = c.get("leftCol", {})
-    right        = c.get("rightCol", {})
+def slide_content(c, idx):
+    heading      = esc(c.get("heading", ""))
+    section_label = esc(c.get("sectionLabel", ""))
+    body         = esc(c.get("body", ""))
+    bullets      = [esc(x) for x in c.get("bullets", [])]
+    image_hint   = c.get("imageHint")
+    has_image    = bool(image_hint)
 
-    def col_html(col):
-        h     = col.get("heading", "")
-        body  = col.get("body", "")
-        items = col.get("bullets", [])
-        bullets = "".join(f'<li class="col-bullet">{b}</li>' for b in items)
-        return f"""
-        <div class="twocol-card">
-          <h3 class="col-heading">{h}</h3>
-          {f'<p class="col-body">{body}</p>' if body else ''}
-          {f'<ul class="col-bullets">{bullets}</ul>' if items else ''}
+    bullets_html = "".join(f'<li class="content-bullet">{b}</li>' for b in bullets)
+
+    image_html = ""
+    if has_image:
+        image_html = f"""
+        <div class="content-image-placeholder">
+          <span class="content-image-hint">{esc(image_hint)}</span>
         </div>"""
 
+    layout_class = "content-layout-split" if has_image else "content-layout-full"
+
     return f"""
-<div class="slide slide-twocol">
+<div class="slide slide-content">
+  <!-- Header bar -->
   <div class="content-header">
     {f'<div class="section-label">{section_label}</div>' if section_label else ''}
     <h2 class="content-heading">{heading}</h2>
   </div>
 
-  <div class="twocol-body">
-    {col_html(left)}
-    {col_html(right)}
+  <!-- Body area -->
+  <div class="content-body {layout_class}">
+    <div class="content-text">
+      {f'<p class="content-body-text">{body}</p>' if body else ''}
+      {f'<ul class="content-bullets">{bullets_html}</ul>' if bullets else ''}
+    </div>
+    {image_html}
   </div>
 
-  <div class="slide-num">{idx:02d}</div>
+  <div class="slide-num">{pad2(idx)}</div>
 </div>
+"""
+
 
-<style>
-.slide-twocol {{
+TWO_COL_CSS = """
+.slide-twocol {
   display: flex;
   flex-direction: column;
-}}
-.twocol-body {{
+}
+.twocol-body {
   flex: 1;
   display: flex;
   gap: 32px;
   padding: 48px 96px;
   align-items: stretch;
-}}
-.twocol-card {{
+}
+.twocol-card {
   flex: 1;
   background: var(--surface);
   border-radius: 12px;
@@ -479,33 +498,33 @@ def slide_two_col(c, idx, palette, fonts):
   display: flex;
   flex-direction: column;
   gap: 24px;
-}}
-.col-heading {{
+}
+.col-heading {
   font-family: var(--font-display);
   font-size: 32px;
   font-weight: 700;
   letter-spacing: -0.5px;
   color: var(--text-primary);
-}}
-.col-body {{
+}
+.col-body {
   font-size: 18px;
   line-height: 1.6;
   color: var(--text-secondary);
-}}
-.col-bullets {{
+}
+.col-bullets {
   list-style: none;
   display: flex;
   flex-direction: column;
   gap: 16px;
-}}
-.col-bullet {{
+}
+.col-bullet {
   font-size: 20px;
   color: var(--text-primary);
   padding-left: 24px;
   position: relative;
   line-height: 1.4;
-}}
-.col-bullet::before {{
+}
+.col-bullet::before {
   content: '';
   position: absolute;
   left: 0;
@@ -514,55 +533,58 @@ def slide_two_col(c, idx, palette, fonts):
   height: 6px;
   border-radius: 50%;
   background: var(--primary);
-}}
-</style>
+}
 """
 
 
-def slide_stats(c, idx, palette, fonts):
-    heading      = c.get("heading", "")
-    section_label = c.get("sectionLabel", "")
-    stats        = c.get("stats", [])
+def slide_two_col(c, idx):
+    heading      = esc(c.get("heading", ""))
+    section_label = esc(c.get("sectionLabel", ""))
+    left         = c.get("leftCol", {})
+    right        = c.get("rightCol", {})
 
-    cards_html = ""
-    for s in stats:
-        trend_html = f'<div class="stat-trend">{s["trend"]}</div>' if s.get("trend") else ""
-        desc_html  = f'<div class="stat-desc">{s["description"]}</div>' if s.get("description") else ""
-        cards_html += f"""
-        <div class="stat-card">
-          <div class="stat-number">{s.get("number","")}</div>
-          <div class="stat-label">{s.get("label","")}</div>
-          {trend_html}
-          {desc_html}
+    def col_html(col):
+        h     = esc(col.get("heading", ""))
+        body  = esc(col.get("body", ""))
+        items = [esc(x) for x in col.get("bullets", [])]
+        bullets = "".join(f'<li class="col-bullet">{b}</li>' for b in items)
+        return f"""
+        <div class="twocol-card">
+          <h3 class="col-heading">{h}</h3>
+          {f'<p class="col-body">{body}</p>' if body else ''}
+          {f'<ul class="col-bullets">{bullets}</ul>' if items else ''}
         </div>"""
 
     return f"""
-<div class="slide slide-stats">
+<div class="slide slide-twocol">
   <div class="content-header">
     {f'<div class="section-label">{section_label}</div>' if section_label else ''}
     <h2 class="content-heading">{heading}</h2>
   </div>
 
-  <div class="stats-body">
-    {cards_html}
+  <div class="twocol-body">
+    {col_html(left)}
+    {col_html(right)}
   </div>
 
-  <div class="slide-num">{idx:02d}</div>
+  <div class="slide-num">{pad2(idx)}</div>
 </div>
+"""
 
-<style>
-.slide-stats {{
+
+STATS_CSS = """
+.slide-stats {
   display: flex;
   flex-direction: column;
-}}
-.stats-body {{
+}
+.stats-body {
   flex: 1;
   display: flex;
   gap: 24px;
   padding: 48px 96px;
   align-items: stretch;
-}}
-.stat-card {{
+}
+.stat-card {
   flex: 1;
   background: var(--surface);
   border-radius: 12px;
@@ -572,76 +594,88 @@ def slide_stats(c, idx, palette, fonts):
   flex-direction: column;
   justify-content: center;
   gap: 12px;
-}}
-.stat-number {{
+}
+.stat-number {
   font-family: var(--font-display);
   font-size: 80px;
   font-weight: 800;
   letter-spacing: -3px;
   line-height: 1;
   color: var(--primary);
-}}
-.stat-label {{
+}
+.stat-label {
   font-size: 16px;
   font-weight: 600;
   letter-spacing: 0.1em;
   text-transform: uppercase;
   color: var(--text-secondary);
-}}
-.stat-trend {{
+}
+.stat-trend {
   font-size: 18px;
   font-weight: 600;
   color: #4ade80;
-}}
-.stat-desc {{
+}
+.stat-desc {
   font-size: 15px;
   color: var(--text-secondary);
   line-height: 1.5;
   margin-top: 4px;
   opacity: 0.7;
-}}
-</style>
+}
 """
 
 
-def slide_quote(c, idx, palette, fonts):
-    quote        = c.get("quote", "")
-    attribution  = c.get("attribution", "")
-    role         = c.get("role", "")
+def slide_stats(c, idx):
+    heading      = esc(c.get("heading", ""))
+    section_label = esc(c.get("sectionLabel", ""))
+    stats        = c.get("stats", [])
 
-    return f"""
-<div class="slide slide-quote">
-  <!-- Full-bleed primary background -->
-  <div class="quote-bg"></div>
+    cards = []
+    for s in stats:
+        number = s.get("number", "")
+        label  = s.get("label", "")
+        trend  = s.get("trend")
+        desc   = s.get("description")
+        trend_html = f'<div class="stat-trend">{esc(trend)}</div>' if trend else ""
+        desc_html  = f'<div class="stat-desc">{esc(desc)}</div>' if desc else ""
+        cards.append(f"""
+        <div class="stat-card">
+          <div class="stat-number">{esc(number)}</div>
+          <div class="stat-label">{esc(label)}</div>
+          {trend_html}
+          {desc_html}
+        </div>""")
+    cards_html = "".join(cards)
 
-  <!-- Giant decorative quote mark -->
-  <div class="quote-deco">"</div>
+    return f"""
+<div class="slide slide-stats">
+  <div class="content-header">
+    {f'<div class="section-label">{section_label}</div>' if section_label else ''}
+    <h2 class="content-heading">{heading}</h2>
+  </div>
 
-  <div class="quote-content">
-    <blockquote class="quote-text">{quote}</blockquote>
-    <div class="quote-rule"></div>
-    <div class="quote-attribution">
-      {f'<span class="quote-name">{attribution}</span>' if attribution else ''}
-      {f'<span class="quote-role">{role}</span>' if role else ''}
-    </div>
+  <div class="stats-body">
+    {cards_html}
   </div>
 
-  <div class="slide-num" style="color: rgba(255,255,255,0.3);">{idx:02d}</div>
+  <div class="slide-num">{pad2(idx)}</div>
 </div>
+"""
 
-<style>
-.slide-quote {{
+
+QUOTE_CSS = """
+.slide-quote {
   display: flex;
   align-items: center;
   justify-content: center;
   background: var(--primary) !important;
-}}
-.quote-bg {{
+}
+.quote-bg {
   position: absolute;
   inset: 0;
   background: var(--primary);
-}}
-.quote-deco {{
+}
+.quote-deco {
   position: absolute;
   top: 60px;
   left: 80px;
@@ -651,14 +685,14 @@ def slide_quote(c, idx, palette, fonts):
   color: rgba(255,255,255,0.08);
   line-height: 1;
   pointer-events: none;
-}}
-.quote-content {{
+}
+.quote-content {
   position: relative;
   max-width: 1200px;
   text-align: center;
   padding: 0 96px;
-}}
-.quote-text {{
+}
+.quote-text {
   font-family: var(--font-display);
   font-size: 48px;
   font-weight: 400;
@@ -667,59 +701,65 @@ def slide_quote(c, idx, palette, fonts):
   letter-spacing: -0.5px;
   margin-bottom: 56px;
   font-style: italic;
-}}
-.quote-rule {{
+}
+.quote-rule {
   width: 64px;
   height: 2px;
   background: rgba(255,255,255,0.35);
   margin: 0 auto 32px;
-}}
-.quote-attribution {{
+}
+.quote-attribution {
   display: flex;
   flex-direction: column;
   align-items: center;
   gap: 6px;
-}}
-.quote-name {{
+}
+.quote-name {
   font-size: 20px;
   font-weight: 600;
   color: #ffffff;
   letter-spacing: 0.03em;
-}}
-.quote-role {{
+}
+.quote-role {
   font-size: 15px;
   color: rgba(255,255,255,0.6);
   letter-spacing: 0.05em;
-}}
-</style>
+}
 """
 
 
-def slide_divider(c, idx, palette, fonts):
-    num   = c.get("sectionNumber", idx)
-    title = c.get("sectionTitle", "")
-    desc  = c.get("description", "")
+def slide_quote(c, idx):
+    quote        = esc(c.get("quote", ""))
+    attribution  = esc(c.get("attribution", ""))
+    role         = esc(c.get("role", ""))
 
     return f"""
-<div class="slide slide-divider">
-  <!-- Left panel -->
-  <div class="div-left">
-    <div class="div-big-num">{num:02d}</div>
-  </div>
+<div class="slide slide-quote">
+  <!-- Full-bleed primary background -->
+  <div class="quote-bg"></div>
 
-  <!-- Right panel -->
-  <div class="div-right">
-    <div class="section-label" style="color: var(--primary);">SECTION {num:02d}</div>
-    <h2 class="div-title">{title}</h2>
-    {f'<p class="div-desc">{desc}</p>' if desc else ''}
+  <!-- Giant decorative quote mark -->
+  <div class="quote-deco">"</div>
+
+  <div class="quote-content">
+    <blockquote class="quote-text">{quote}</blockquote>
+    <div class="quote-rule"></div>
+    <div class="quote-attribution">
+      {f'<span class="quote-name">{attribution}</span>' if attribution else ''}
+      {f'<span class="quote-role">{role}</span>' if role else ''}
+    </div>
   </div>
+
+  <div class="slide-num" style="color: rgba(255,255,255,0.3);">{pad2(idx)}</div>
 </div>
+"""
+
 
-<style>
-.slide-divider {{
+DIVIDER_CSS = """
+.slide-divider {
   display: flex;
-}}
-.div-left {{
+}
+.div-left {
   width: 45%;
   height: 100%;
   background: var(--primary);
@@ -727,23 +767,23 @@ def slide_divider(c, idx, palette, fonts):
   align-items: center;
   justify-content: center;
   position: relative;
-}}
-.div-big-num {{
+}
+.div-big-num {
   font-family: var(--font-display);
   font-size: 320px;
   font-weight: 900;
   color: rgba(0,0,0,0.15);
   line-height: 1;
   user-select: none;
-}}
-.div-right {{
+}
+.div-right {
   flex: 1;
   display: flex;
   flex-direction: column;
   justify-content: center;
   padding: 96px 96px 96px 80px;
-}}
-.div-title {{
+}
+.div-title {
   font-family: var(--font-display);
   font-size: 64px;
   font-weight: 700;
@@ -751,89 +791,76 @@ def slide_divider(c, idx, palette, fonts):
   line-height: 1.05;
   color: var(--text-primary);
   margin: 20px 0 32px;
-}}
-.div-desc {{
+}
+.div-desc {
   font-size: 22px;
   line-height: 1.6;
   color: var(--text-secondary);
   max-width: 560px;
-}}
-</style>
+}
 """
 
 
-def slide_closing(c, idx, palette, fonts):
-    tagline    = c.get("tagline", "THANK YOU")
-    heading    = c.get("heading", "Let's Build Together")
-    subheading = c.get("subheading", "")
-    takeaways  = c.get("keyTakeaways", [])
-    cta        = c.get("cta", "")
-    contact    = c.get("contactInfo", "")
-
-    takeaway_html = ""
-    for t in takeaways:
-        takeaway_html += f'<li class="closing-takeaway"><span class="takeaway-check">✓</span>{t}</li>'
+def slide_divider(c, idx):
+    num   = pad2(c.get("sectionNumber", idx))
+    title = esc(c.get("sectionTitle", ""))
+    desc  = esc(c.get("description", ""))
 
     return f"""
-<div class="slide slide-closing">
-  <!-- Full-bleed background -->
-  <!-- Decorative circles -->
-  <div class="closing-circle c1"></div>
-  <div class="closing-circle c2"></div>
-
-  <div class="closing-left">
-    <div class="closing-tagline">{tagline}</div>
-    <h1 class="closing-heading">{heading}</h1>
-    {f'<p class="closing-subheading">{subheading}</p>' if subheading else ''}
-    {f'<div class="closing-cta">{cta}</div>' if cta else ''}
+<div class="slide slide-divider">
+  <!-- Left panel -->
+  <div class="div-left">
+    <div class="div-big-num">{num}</div>
   </div>
 
-  {f'''<div class="closing-right">
-    <div class="closing-takeaways-label">Key Takeaways</div>
-    <ul class="closing-takeaways">{takeaway_html}</ul>
-  </div>''' if takeaways else ''}
-
-  {f'<div class="closing-contact">{contact}</div>' if contact else ''}
+  <!-- Right panel -->
+  <div class="div-right">
+    <div class="section-label" style="color: var(--primary);">SECTION {num}</div>
+    <h2 class="div-title">{title}</h2>
+    {f'<p class="div-desc">{desc}</p>' if desc else ''}
+  </div>
 </div>
+"""
 
-<style>
-.slide-closing {{
+
+CLOSING_CSS = """
+.slide-closing {
   background: var(--primary) !important;
   display: flex;
   align-items: stretch;
   position: relative;
   overflow: hidden;
-}}
-.closing-circle {{
+}
+.closing-circle {
   position: absolute;
   border-radius: 50%;
   background: rgba(255,255,255,0.04);
   pointer-events: none;
-}}
-.c1 {{
+}
+.c1 {
   width: 800px; height: 800px;
   right: -200px; bottom: -200px;
-}}
-.c2 {{
+}
+.c2 {
   width: 500px; height: 500px;
   right: 200px; top: -150px;
-}}
-.closing-left {{
+}
+.closing-left {
   flex: 1;
   display: flex;
   flex-direction: column;
   justify-content: center;
   padding: 96px;
-}}
-.closing-tagline {{
+}
+.closing-tagline {
   font-size: 13px;
   font-weight: 700;
   letter-spacing: 0.25em;
   text-transform: uppercase;
   color: rgba(255,255,255,0.6);
   margin-bottom: 24px;
-}}
-.closing-heading {{
+}
+.closing-heading {
   font-family: var(--font-display);
   font-size: 80px;
   font-weight: 800;
@@ -841,23 +868,23 @@ def slide_closing(c, idx, palette, fonts):
   line-height: 1.05;
   color: #ffffff;
   margin-bottom: 28px;
-}}
-.closing-subheading {{
+}
+.closing-subheading {
   font-size: 24px;
   line-height: 1.5;
   color: rgba(255,255,255,0.75);
   margin-bottom: 48px;
   max-width: 560px;
-}}
-.closing-cta {{
+}
+.closing-cta {
   font-size: 20px;
   font-weight: 600;
   color: rgba(255,255,255,0.9);
   padding: 16px 0;
   border-top: 1px solid rgba(255,255,255,0.2);
   display: inline-block;
-}}
-.closing-right {{
+}
+.closing-right {
   width: 560px;
   background: rgba(0,0,0,0.15);
   display: flex;
@@ -865,43 +892,79 @@ def slide_closing(c, idx, palette, fonts):
   justify-content: center;
   padding: 80px 64px;
   gap: 32px;
-}}
-.closing-takeaways-label {{
+}
+.closing-takeaways-label {
   font-size: 12px;
   font-weight: 700;
   letter-spacing: 0.15em;
   text-transform: uppercase;
   color: rgba(255,255,255,0.5);
-}}
-.closing-takeaways {{
+}
+.closing-takeaways {
   list-style: none;
   display: flex;
   flex-direction: column;
   gap: 20px;
-}}
-.closing-takeaway {{
+}
+.closing-takeaway {
   display: flex;
   align-items: flex-start;
   gap: 16px;
   font-size: 18px;
   line-height: 1.5;
   color: rgba(255,255,255,0.9);
-}}
-.takeaway-check {{
+}
+.takeaway-check {
   color: rgba(255,255,255,0.5);
   flex-shrink: 0;
   font-size: 14px;
   margin-top: 3px;
-}}
-.closing-contact {{
+}
+.closing-contact {
   position: absolute;
   bottom: 48px;
   left: 96px;
   font-size: 15px;
   color: rgba(255,255,255,0.45);
   letter-spacing: 0.05em;
-}}
-</style>
+}
+"""
+
+
+def slide_closing(c, idx):
+    tagline    = esc(c.get("tagline", "THANK YOU"))
+    heading    = esc(c.get("heading", "Let's Build Together"))
+    subheading = esc(c.get("subheading", ""))
+    takeaways  = [esc(x) for x in c.get("keyTakeaways", [])]
+    cta        = esc(c.get("cta", ""))
+    contact    = esc(c.get("contactInfo", ""))
+
+    takeaway_html = "".join(
+        f'<li class="closing-takeaway"><span class="takeaway-check">✓</span>{t}</li>'
+        for t in takeaways
+    )
+
+    return f"""
+<div class="slide slide-closing">
+  <!-- Full-bleed background -->
+  <!-- Decorative circles -->
+  <div class="closing-circle c1"></div>
+  <div class="closing-circle c2"></div>
+
+  <div class="closing-left">
+    <div class="closing-tagline">{tagline}</div>
+    <h1 class="closing-heading">{heading}</h1>
+    {f'<p class="closing-subheading">{subheading}</p>' if subheading else ''}
+    {f'<div class="closing-cta">{cta}</div>' if cta else ''}
+  </div>
+
+  {f'''<div class="closing-right">
+    <div class="closing-takeaways-label">Key Takeaways</div>
+    <ul class="closing-takeaways">{takeaway_html}</ul>
+  </div>''' if takeaways else ''}
+
+  {f'<div class="closing-contact">{contact}</div>' if contact else ''}
+</div>
 """
 
 
@@ -920,35 +983,101 @@ BUILDERS = {
     "CLOSING": slide_closing,
 }
 
+SLIDE_CSS = (
+    HERO_CSS,
+    AGENDA_CSS,
+    CONTENT_CSS,
+    TWO_COL_CSS,
+    STATS_CSS,
+    QUOTE_CSS,
+    DIVIDER_CSS,
+    CLOSING_CSS,
+)
+
 
 # ─────────────────────────────────────────────────────────────
 # PAGE TEMPLATE
 # ─────────────────────────────────────────────────────────────
 
-def make_page(slide_html, css_vars, google_fonts_url, title, slide_num, total):
-    """Wrap slide HTML in a full standalone page."""
+PAGE_FOOT = """
+</body>
+</html>"""
+
+
+def make_page_head(title, google_fonts_url):
+    """Build the deck-wide page head once, split around the slide number in <title>.
+
+    A slide page is then head_open + str(num) + head_close + slide_html + PAGE_FOOT.
+    """
+    head_open = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=1920">
+  <title>Slide """
+    head_close = f""" — {esc(title)}</title>
+  <link rel="preconnect" href="https://fonts.googleapis.com">
+  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+  <link href="{google_fonts_url}" rel="stylesheet">
+  <link href="{SHARED_CSS_FILE}" rel="stylesheet">
+</head>
+<body>
+"""
+    return head_open, head_close
+
+
+DECK_FILE = "all.html"
+
+DECK_CSS = """
+html, body { height: auto; overflow: visible; }
+.page {
+  width: 1920px;
+  height: 1080px;
+  position: relative;
+  overflow: hidden;
+  page-break-after: always;
+}
+"""
+
+
+def make_deck_page(title, google_fonts_url, sections):
+    """Build all.html: every (idx, slide_html) fragment on one page, anchored as #slide-NN."""
+    body = "".join(
+        f'<section id="slide-{pad2(idx)}" class="page">{slide_html}</section>\n'
+        for idx, slide_html in sections
+    )
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=1920">
-  <title>Slide {slide_num} — {title}</title>
+  <title>{esc(title)}</title>
   <link rel="preconnect" href="https://fonts.googleapis.com">
   <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
   <link href="{google_fonts_url}" rel="stylesheet">
-  <style>
-{css_vars}
-  </style>
+  <link href="{SHARED_CSS_FILE}" rel="stylesheet">
+  <style>{DECK_CSS}</style>
 </head>
 <body>
-{slide_html}
-</body>
+{body}</body>
 </html>"""
 
 
+PAGE_FOOT_BYTES = PAGE_FOOT.encode("utf-8")
+
+
+def render_page(slide_html, idx, head_open, head_close):
+    """Wrap a rendered slide fragment as a page of UTF-8 byte chunks. Pure: no I/O, no shared state.
+
+    head_open/head_close are the deck-wide head halves, already encoded once
+    per build; only the slide number and fragment are encoded per slide.
+    """
+    return [head_open, str(idx).encode("ascii"), head_close, slide_html.encode("utf-8"), PAGE_FOOT_BYTES]
+
+
 def build_css_vars(palette, fonts):
     """Build :root CSS with palette + font vars."""
-    return SHARED_CSS % {
+    return Template(SHARED_CSS).substitute({
         "primary":       palette.get("primary",       "#2D3FE0"),
         "background":    palette.get("background",    "#0A0A0A"),
         "surface":       palette.get("surface",       "#111111"),
@@ -957,21 +1086,92 @@ def build_css_vars(palette, fonts):
         "textSecondary": palette.get("textSecondary", "#888888"),
         "fontDisplay":   fonts.get("display",         "Inter"),
         "fontBody":      fonts.get("body",            "Inter"),
-    }
+    })
+
+
+def build_stylesheet(palette, fonts):
+    """Build the deck-wide stylesheet: palette vars, shared rules and every slide type's CSS."""
+    return build_css_vars(palette, fonts) + "".join(SLIDE_CSS)
 
 
 def build_google_fonts_url(fonts):
-    """Generate Google Fonts import URL for both fonts."""
-    families = set()
-    for v in fonts.values():
-        name = v.replace(" ", "+")
-        families.add(f"family={name}:wght@300;400;500;600;700;800;900")
-    # Always include Inter as fallback
-    families.add("family=Inter:wght@300;400;500;600;700;800")
-    query = "&".join(sorted(families))
+    """Generate Google Fonts import URL for the display + body fonts (+ Inter fallback)."""
+    # Display, body, then Inter as fallback; dict.fromkeys dedupes in that order
+    names = dict.fromkeys((fonts.get("display", "Inter"), fonts.get("body", "Inter"), "Inter"))
+    query = "&".join(
+        f"family={name.replace(' ', '+')}:wght@300;400;500;600;700;800;900" for name in names
+    )
     return f"https://fonts.googleapis.com/css2?{query}&display=swap"
 
 
+# ─────────────────────────────────────────────────────────────
+# FILE OUTPUT
+# ─────────────────────────────────────────────────────────────
+
+WRITE_WORKERS = 8
+
+
+def write_chunks(path, chunks):
+    """Write a list of byte chunks to path — one writev() call where the OS has it."""
+    if not hasattr(os, "writev"):  # Windows
+        path.write_bytes(b"".join(chunks))
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        written = os.writev(fd, chunks)
+        if written < sum(map(len, chunks)):
+            # Short write (rare): only now join, then finish the remainder
+            rest = memoryview(b"".join(chunks))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+    finally:
+        os.close(fd)
+
+
+def write_pages(slides_dir, pages):
+    """Write (fname, chunks) pairs into slides_dir as one batch on a small thread pool."""
+    # Imported here, not at module top: concurrent.futures pulls in logging (~16 ms)
+    from concurrent.futures import ThreadPoolExecutor
+
+    def write_one(page):
+        fname, chunks = page
+        write_chunks(slides_dir / fname, chunks)
+
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as ex:
+        # Drain the iterator so write errors are raised here
+        list(ex.map(write_one, pages))
+
+
+# ─────────────────────────────────────────────────────────────
+# BUILD CACHE — skip slides whose inputs are unchanged since last build
+# ─────────────────────────────────────────────────────────────
+
+BUILD_CACHE_FILE    = ".build-cache.json"
+BUILD_CACHE_VERSION = 2   # bump whenever builder/page output changes
+
+
+def slide_digest(stype, content, idx, page_head):
+    """Hash everything a slide page's bytes depend on."""
+    key = json.dumps([stype, idx, content, page_head], sort_keys=True)
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_build_cache(cache_path):
+    """Return {fname: digest} from the previous build, or {} if unusable."""
+    try:
+        cache = json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != BUILD_CACHE_VERSION:
+        return {}
+    slides = cache.get("slides")
+    return slides if isinstance(slides, dict) else {}
+
+
+def save_build_cache(cache_path, digests):
+    cache_path.write_bytes(json_dumps({"version": BUILD_CACHE_VERSION, "slides": digests}))
+
+
 # ─────────────────────────────────────────────────────────────
 # INDEX PAGE
 # ─────────────────────────────────────────────────────────────
@@ -985,7 +1185,7 @@ def make_index(title, slide_files):
 <html lang="en">
 <head>
   <meta charset="UTF-8">
-  <title>{title} — Slide Index</title>
+  <title>{esc(title)} — Slide Index</title>
   <style>
     body {{ font-family: sans-serif; background: #0a0a0a; color: #fff; padding: 48px; }}
     h1 {{ font-size: 32px; margin-bottom: 32px; }}
@@ -995,7 +1195,7 @@ def make_index(title, slide_files):
   </style>
 </head>
 <body>
-  <h1>{title}</h1>
+  <h1>{esc(title)}</h1>
   <ul>
 {links}
   </ul>
@@ -1004,27 +1204,17 @@ def make_index(title, slide_files):
 
 
 # ─────────────────────────────────────────────────────────────
-# MAIN
+# BUILD — library entry point (no CLI, no argparse)
 # ─────────────────────────────────────────────────────────────
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="figma-ppt: Build HTML slide website from slides-plan.json"
-    )
-    parser.add_argument("--slides-plan",  default="./slides-plan.json",  help="Path to slides-plan.json")
-    parser.add_argument("--output-dir",   default="./slide-output",       help="Output directory")
-    args = parser.parse_args()
-
-    plan_path = Path(args.slides_plan)
-    out_dir   = Path(args.output_dir)
-
-    # Load plan
-    if not plan_path.exists():
-        print(f"ERROR: slides-plan.json not found at {plan_path}", file=sys.stderr)
-        sys.exit(1)
+def build(plan, out_dir, force=False):
+    """Build the slide website for `plan` into `out_dir`.
 
-    with open(plan_path, encoding="utf-8") as f:
-        plan = json.load(f)
+    Returns (results, rebuilt): the slide-urls.json entries in order, and
+    the set of slide files that were re-rendered (the rest were unchanged).
+    Raises ValueError if the plan has no slides.
+    """
+    out_dir = Path(out_dir)
 
     title   = plan.get("title", "Presentation")
     palette = plan.get("palette", {})
@@ -1032,54 +1222,78 @@ def main():
     slides  = plan.get("slides", [])
 
     if not slides:
-        print("ERROR: No slides in plan.", file=sys.stderr)
-        sys.exit(1)
+        raise ValueError("No slides in plan.")
 
     # Prepare directories
     slides_dir = out_dir / "slides"
     slides_dir.mkdir(parents=True, exist_ok=True)
 
-    css_vars         = build_css_vars(palette, fonts)
     google_fonts_url = build_google_fonts_url(fonts)
+    head_open, head_close = make_page_head(title, google_fonts_url)
+    head_bytes = (head_open.encode("utf-8"), head_close.encode("utf-8"))
+
+    # One stylesheet per deck, linked from every slide page
+    (slides_dir / SHARED_CSS_FILE).write_text(
+        build_stylesheet(palette, fonts),
+        encoding="utf-8"
+    )
+
+    cache_path = out_dir / BUILD_CACHE_FILE
+    cache      = {} if force else load_build_cache(cache_path)
+    digests    = {}
 
     slide_files = []
     results     = []
+    deck        = []
+    jobs        = []
 
     for i, slide in enumerate(slides, start=1):
         stype   = slide.get("type", "CONTENT").upper()
         content = slide.get("content", {})
-        builder = BUILDERS.get(stype)
 
-        if not builder:
+        if stype not in BUILDERS:
             print(f"WARNING: Unknown slide type '{stype}' at index {i}. Skipping.", file=sys.stderr)
             continue
 
-        # Build slide HTML fragment
-        slide_html = builder(content, i, palette, fonts)
-
-        # Wrap in full page
-        page_html = make_page(
-            slide_html    = slide_html,
-            css_vars      = css_vars,
-            google_fonts_url = google_fonts_url,
-            title         = title,
-            slide_num     = i,
-            total         = len(slides),
-        )
-
-        # Write file
-        slug = stype.lower().replace("_", "-")
-        fname = f"{i:02d}-{slug}.html"
-        (slides_dir / fname).write_text(page_html, encoding="utf-8")
+        num   = pad2(i)
+        slug  = stype.lower().replace("_", "-")
+        fname = f"{num}-{slug}.html"
         slide_files.append(fname)
+        deck.append((stype, content, i))
+
+        digest = slide_digest(stype, content, i, head_close)
+        digests[fname] = digest
+        if cache.get(fname) != digest or not (slides_dir / fname).exists():
+            jobs.append((fname, stype, content, i))
 
         results.append({
             "index": i,
             "type":  stype,
             "file":  fname,
             "url":   f"http://localhost:7890/slides/{fname}",
+            "anchor": f"slides/{DECK_FILE}#slide-{num}",  # relative to the server root, like url
         })
-        print(f"  [{i:02d}] {stype:10s} → slides/{fname}")
+
+    # Render every changed slide, then write them in one batch. Fragments are
+    # kept by index so all.html below reuses them instead of rendering twice.
+    fragments = {i: BUILDERS[stype](content, i) for _, stype, content, i in jobs}
+    pages = [
+        (fname, render_page(fragments[i], i, *head_bytes))
+        for fname, _, _, i in jobs
+    ]
+
+    # all.html carries every slide, so rebuild it whenever the slide set changed at all
+    if digests != cache or not (slides_dir / DECK_FILE).exists():
+        deck_html = make_deck_page(title, google_fonts_url, [
+            (i, fragments[i] if i in fragments else BUILDERS[stype](content, i))
+            for stype, content, i in deck
+        ])
+        pages.append((DECK_FILE, [deck_html.encode("utf-8")]))
+
+    # Drop the old cache first so an interrupted write can't leave it vouching for new bytes
+    cache_path.unlink(missing_ok=True)
+    write_pages(slides_dir, pages)
+    save_build_cache(cache_path, digests)
 
     # Write index page
     (out_dir / "index.html").write_text(
@@ -1087,19 +1301,56 @@ def main():
         encoding="utf-8"
     )
 
-    # Write slide-urls.json for the capture script
-    urls_path = out_dir / "slide-urls.json"
-    with open(urls_path, "w", encoding="utf-8") as f:
-        json.dump({"title": title, "slides": results}, f, indent=2, ensure_ascii=False)
+    # Write slide-urls.json for the capture script (serialized up front, one write)
+    (out_dir / "slide-urls.json").write_bytes(json_dumps({"title": title, "slides": results}))
+
+    return results, {job[0] for job in jobs}
+
+
+# ─────────────────────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────────────────────
+
+def main():
+    import argparse  # CLI only; importers of build() skip it
+
+    parser = argparse.ArgumentParser(
+        description="figma-ppt: Build HTML slide website from slides-plan.json"
+    )
+    parser.add_argument("--slides-plan",  default="./slides-plan.json",  help="Path to slides-plan.json")
+    parser.add_argument("--output-dir",   default="./slide-output",       help="Output directory")
+    parser.add_argument("--force",        action="store_true",            help="Rebuild every slide, ignoring the build cache")
+    args = parser.parse_args()
+
+    plan_path = Path(args.slides_plan)
+    out_dir   = Path(args.output_dir)
+
+    # Load plan
+    if not plan_path.exists():
+        print(f"ERROR: slides-plan.json not found at {plan_path}", file=sys.stderr)
+        sys.exit(1)
+
+    plan = json_loads(plan_path.read_bytes())
+
+    try:
+        results, rebuilt = build(plan, out_dir, force=args.force)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for r in results:
+        note = "" if r["file"] in rebuilt else "  (unchanged)"
+        print(f"  [{r['index']:02d}] {r['type']:10s} → slides/{r['file']}{note}")
 
     print(f"\n[build-slides] SUCCESS")
-    print(f"  Slides:  {len(results)}")
+    print(f"  Slides:  {len(results)} ({len(rebuilt)} rebuilt)")
     print(f"  Output:  {out_dir.resolve()}")
     print(f"  Index:   {(out_dir / 'index.html').resolve()}")
-    print(f"  URLs:    {urls_path.resolve()}")
+    print(f"  URLs:    {(out_dir / 'slide-urls.json').resolve()}")
+    print(f"  Deck:    {(out_dir / 'slides' / DECK_FILE).resolve()}")
     print(f"\nTo serve locally:")
     print(f"  python -m http.server 7890 --directory {out_dir.resolve()}")
-    print(f"\nFirst slide: http://localhost:7890/slides/{slide_files[0]}")
+    print(f"\nFirst slide: http://localhost:7890/slides/{results[0]['file']}")
 
 
 if __name__ == "__main__":
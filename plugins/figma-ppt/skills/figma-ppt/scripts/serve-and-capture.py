@@ -25,34 +25,247 @@ import json
 import os
 import signal
 import socket
-import subprocess
 import sys
-import time
 from pathlib import Path
 
+try:
+    import orjson  # optional: faster JSON parse/serialize
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON from UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize to 2-space-indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def emit_json(obj):
+    """Write obj to stdout as one encoded JSON chunk, bypassing the text layer."""
+    sys.stdout.buffer.write(json_dumps(obj) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+# SO_REUSEADDR (skip TIME_WAIT leftovers) only where it can't mask a live listener.
+# Windows lets the bind succeed on top of one outright; BSD/macOS lets 127.0.0.1
+# bind beside a wildcard listener such as `python -m http.server 7890`. Linux
+# refuses both, so the bind stays a true "port taken" test there.
+REUSE_ADDR = sys.platform.startswith("linux")
+
+
+def bind_port(port):
+    """Return a TCP socket bound to 127.0.0.1:port. Raises OSError if the port is taken."""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if REUSE_ADDR:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind(("127.0.0.1", port))
+    except OSError:
+        s.close()
+        raise
+    return s
+
 
 def port_in_use(port):
-    """Check if a port is already in use."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(("localhost", port)) == 0
+    """Check if a port is already in use by trying to bind it (no TCP handshake)."""
+    try:
+        bind_port(port).close()
+    except OSError:  # EADDRINUSE (or otherwise unbindable)
+        return True
+    return False
 
 
-def find_free_port(start=7890):
-    """Find a free port starting from `start`."""
-    for port in range(start, start + 20):
-        if not port_in_use(port):
-            return port
+def find_free_port(start=7890, count=20):
+    """Find a free port in range(start, start + count) in one bind sweep (None if all taken)."""
+    for port in range(start, start + count):
+        try:
+            bind_port(port).close()
+        except OSError:
+            continue
+        return port
     return None
 
 
+def linux_pids_on_port(port):
+    """PIDs with a TCP socket LISTENing on `port`, read from /proc (no lsof fork)."""
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)  # header
+                for line in f:
+                    cols = line.split()
+                    # cols[1] = local "HEXIP:HEXPORT", cols[3] = state (0A = LISTEN), cols[9] = inode
+                    if cols[3] == "0A" and int(cols[1].rsplit(":", 1)[1], 16) == port:
+                        inodes.add(f"socket:[{cols[9]}]")
+        except FileNotFoundError:
+            continue
+    if not inodes:
+        return set()
+
+    pids = set()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:  # exited, or not ours to inspect
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(f"{fd_dir}/{fd}") in inodes:
+                    pids.add(int(pid))
+                    break
+            except OSError:
+                continue
+    return pids
+
+
+def lsof_pids_on_port(port):
+    """PIDs LISTENing on `port` via one lsof child (macOS, or Linux without /proc)."""
+    import subprocess
+    try:
+        out = subprocess.run(
+            ["lsof", "-t", f"-iTCP:{port}", "-sTCP:LISTEN", "-P", "-n"],
+            capture_output=True, text=True, check=False,
+        ).stdout
+    except FileNotFoundError:  # no lsof installed
+        return set()
+    return {int(pid) for pid in out.split()}
+
+
+def netstat_pids_on_port(port):
+    """PIDs LISTENing on `port` via one netstat child (Windows)."""
+    import subprocess
+    out = subprocess.run(
+        ["netstat", "-ano"], capture_output=True, text=True, check=False,
+    ).stdout
+    pids = set()
+    for line in out.splitlines():
+        cols = line.split()
+        # Proto  Local  Foreign  State  PID; a listener's foreign address ends in ":0"
+        # (checked instead of the State column, which Windows localizes)
+        if (len(cols) == 5 and cols[0] == "TCP"
+                and cols[1].rsplit(":", 1)[-1] == str(port) and cols[2].endswith(":0")):
+            pids.add(int(cols[4]))
+    pids.discard(0)
+    return pids
+
+
 def kill_port(port):
-    """Kill whatever is using the given port (cross-platform)."""
-    if sys.platform == "win32":
-        # Windows
-        os.system(f"for /f \"tokens=5\" %a in ('netstat -aon ^| findstr :{port}') do taskkill /F /PID %a >nul 2>&1")
+    """Kill whatever is listening on the given port (cross-platform, no shell)."""
+    if sys.platform.startswith("linux") and os.path.exists("/proc/net/tcp"):
+        pids = linux_pids_on_port(port)
+    elif sys.platform == "win32":
+        pids = netstat_pids_on_port(port)
     else:
-        # macOS / Linux
-        os.system(f"lsof -t -i:{port} | xargs kill -9 2>/dev/null || true")
+        pids = lsof_pids_on_port(port)
+
+    kill_sig = getattr(signal, "SIGKILL", signal.SIGTERM)  # Windows: TerminateProcess
+    for pid in pids:
+        try:
+            os.kill(pid, kill_sig)
+        except OSError:  # already gone, or not ours
+            pass
+
+
+def make_server(port, directory, sock=None):
+    """Create a SlideServer serving `directory`, bound and listening on 127.0.0.1:port.
+
+    With `sock`, adopt that already-listening socket instead of binding a new one.
+    """
+    # Imported here, not at module top: http.server pulls in http.client, email
+    # and ssl (~25 ms) that the --kill-only path never needs.
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class SlideServer(ThreadingHTTPServer):
+        # Same SO_REUSEADDR rule as bind_port, so a port that is still taken fails
+        # start_server. (No SO_REUSEPORT: two servers sharing the port would split
+        # requests between different decks.)
+        allow_reuse_address = REUSE_ADDR
+
+    class SlideHandler(SimpleHTTPRequestHandler):
+        # TCP_NODELAY on each accepted socket (set by StreamRequestHandler.setup):
+        # small localhost responses go out at once instead of waiting on Nagle.
+        disable_nagle_algorithm = True
+
+    handler = partial(SlideHandler, directory=directory)
+    if sock is None:
+        return SlideServer(("127.0.0.1", port), handler)
+    srv = SlideServer(sock.getsockname(), handler, bind_and_activate=False)
+    srv.socket.close()
+    srv.socket = sock
+    return srv
+
+
+def serve_shared(directory):
+    """Windows child: adopt the listener the parent shared over stdin and serve it."""
+    sock = socket.fromshare(sys.stdin.buffer.read())
+    sys.stdout.buffer.write(b"ok\n")  # parent may now close its handle
+    sys.stdout.close()
+    make_server(None, directory, sock).serve_forever()
+
+
+def start_server(port, directory):
+    """Start the slide server in the background and return its pid (None if it failed).
+
+    The socket is bound and listening in this process before the server starts,
+    so there is no race with another process grabbing the port and no
+    readiness poll. POSIX: fork a detached child that serves it. Windows has no
+    fork: spawn a child of this script and hand it the socket via socket.share.
+    """
+    try:
+        srv = make_server(port, directory)
+    except OSError:
+        return None
+
+    if hasattr(os, "fork"):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            # Child: detach from the caller's session and pipes, then serve until killed
+            try:
+                os.setsid()
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for fd in (0, 1, 2):
+                    os.dup2(devnull, fd)
+                srv.serve_forever()
+            finally:
+                os._exit(0)
+        srv.server_close()
+        return pid
+
+    import subprocess
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-shared", "--output-dir", directory],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        proc.stdin.write(srv.socket.share(proc.pid))
+        proc.stdin.close()
+        ok = proc.stdout.readline() == b"ok\n"  # child holds its own handle now
+    except OSError:
+        ok = False
+    finally:
+        proc.stdout.close()
+        srv.server_close()
+    if not ok:
+        proc.kill()
+        return None
+    return proc.pid
 
 
 def main():
@@ -62,74 +275,79 @@ def main():
     parser.add_argument("--output-dir", default="./slide-output", help="Slide output directory")
     parser.add_argument("--port",       default=7890, type=int,   help="HTTP server port")
     parser.add_argument("--kill-only",  action="store_true",      help="Kill the server on this port and exit")
+    parser.add_argument("--serve-shared", action="store_true", help=argparse.SUPPRESS)  # Windows server child
     args = parser.parse_args()
 
-    out_dir = Path(args.output_dir)
+    if args.serve_shared:
+        serve_shared(args.output_dir)
+        return
+
     port    = args.port
 
     # Kill-only mode
     if args.kill_only:
-        kill_port(port)
-        print(json.dumps({"status": "killed", "port": port}))
+        if port_in_use(port):
+            kill_port(port)
+            status = "killed"
+        else:
+            status = "not_running"  # nothing listening: skip the lsof/netstat child
+        emit_json({"status": status, "port": port})
         return
 
+    out_dir = Path(args.output_dir).resolve()  # resolved once, reused below
+
+    # Load slide URLs first: the single open doubles as the output-dir check, and
+    # nothing (old server, new server) is touched if the build output is missing
+    try:
+        with open(out_dir / "slide-urls.json", "rb") as f:
+            url_data = json_loads(f.read())
+    except FileNotFoundError:
+        if os.path.isdir(out_dir):
+            print(f"ERROR: slide-urls.json not found in {out_dir}", file=sys.stderr)
+        else:
+            print(f"ERROR: Output directory not found: {out_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    # Rebuild URLs with current port (in case default changed), before any server
+    # is started so a malformed file can't leave one behind. Popping the parsed
+    # list means it is freed as soon as the copy is built, not held until exit.
+    base_url = f"http://localhost:{port}"
+    prefix   = base_url + "/slides/"
+    title    = url_data["title"]
+    slides   = []
+    for slide in url_data.pop("slides"):
+        slide = {**slide, "url": prefix + slide["file"]}
+        if slide.get("anchor"):  # absent in output built before all.html existed
+            slide["deck_url"] = f"{base_url}/{slide['anchor']}"
+        slides.append(slide)
+    del url_data
+
     # Kill any existing process on this port
     if port_in_use(port):
         print(f"[serve] Port {port} in use. Killing existing process...", file=sys.stderr)
         kill_port(port)
-        time.sleep(1)
+        import time
+        # Wait until the listener is actually gone (usually immediate), up to ~1 s
+        for _ in range(100):
+            if not port_in_use(port):
+                break
+            time.sleep(0.01)
 
     # Start HTTP server
-    if not out_dir.exists():
-        print(f"ERROR: Output directory not found: {out_dir}", file=sys.stderr)
-        sys.exit(1)
-
-    server_cmd = [
-        sys.executable, "-m", "http.server", str(port),
-        "--directory", str(out_dir.resolve()),
-        "--bind", "127.0.0.1",
-    ]
-
-    proc = subprocess.Popen(
-        server_cmd,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-
-    # Wait for server to start
-    for _ in range(20):
-        time.sleep(0.3)
-        if port_in_use(port):
-            break
-    else:
+    pid = start_server(port, str(out_dir))
+    if pid is None:
         print("ERROR: Server failed to start.", file=sys.stderr)
-        proc.terminate()
         sys.exit(1)
 
-    # Load slide URLs
-    urls_path = out_dir / "slide-urls.json"
-    if not urls_path.exists():
-        print(f"ERROR: slide-urls.json not found in {out_dir}", file=sys.stderr)
-        proc.terminate()
-        sys.exit(1)
-
-    with open(urls_path, encoding="utf-8") as f:
-        url_data = json.load(f)
-
-    # Rebuild URLs with current port (in case default changed)
-    for slide in url_data["slides"]:
-        fname = slide["file"]
-        slide["url"] = f"http://localhost:{port}/slides/{fname}"
-
     # Output result for Claude
     result = {
         "status": "ready",
-        "pid":    proc.pid,
+        "pid":    pid,
         "port":   port,
-        "base_url": f"http://localhost:{port}",
-        "title":  url_data["title"],
-        "slide_count": len(url_data["slides"]),
-        "slides": url_data["slides"],
+        "base_url": base_url,
+        "title":  title,
+        "slide_count": len(slides),
+        "slides": slides,
         "kill_command": f"python skills/figma-ppt/scripts/serve-and-capture.py --kill-only --port {port}",
         "instructions": (
             "Server is running. Call generate_figma_design for each slide URL in order. "
@@ -137,7 +355,7 @@ def main():
         ),
     }
 
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    emit_json(result)
 
 
 if __name__ == "__main__":